@@ -3,13 +3,27 @@
 Download sample PDF files with tables and flowcharts for Document AI testing.
 """
 
-import os
-import urllib.request
+import asyncio
+import json
 from pathlib import Path
 
+import aiofiles
+import aiohttp
+
 SAMPLE_DIR = Path("sample_pdfs")
 SAMPLE_DIR.mkdir(exist_ok=True)
 
+# ETag / Last-Modified validators per file, used for conditional re-downloads
+CACHE_FILE = SAMPLE_DIR / ".cache.json"
+
+# Stream responses to disk in 64 KiB chunks instead of buffering whole PDFs
+CHUNK_SIZE = 64 * 1024
+
+# Add headers to mimic browser request
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
 # Sample files to download
 SAMPLES = {
     "research_paper_with_tables.pdf": {
@@ -34,32 +48,77 @@ SAMPLES = {
     }
 }
 
-def download_file(url: str, filepath: Path, description: str) -> bool:
-    """Download a file from URL to filepath."""
+def load_cache() -> dict:
+    """Load the validator cache, or an empty one if missing or unreadable."""
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache: dict) -> None:
+    """Persist the validator cache next to the sample files."""
+    with open(CACHE_FILE, 'w') as f:
+        json.dump(cache, f, indent=2)
+
+async def download_file(
+    session: aiohttp.ClientSession,
+    url: str,
+    filepath: Path,
+    description: str,
+    cache: dict
+) -> bool:
+    """
+    Download a file from URL to filepath.
+    
+    If the file already exists and cache holds its validators, a conditional
+    GET is sent and a 304 response leaves the local copy untouched. On a fresh
+    download the response's ETag / Last-Modified are stored back into cache
+    (servers that send neither get no entry, so the file is skipped next run).
+    """
+    # Write to a temporary file so an interrupted download is never
+    # mistaken for a complete one on the next run
+    part_path = filepath.with_name(filepath.name + ".part")
     try:
         print(f"Downloading: {description}")
         print(f"  URL: {url}")
         print(f"  Saving to: {filepath}")
         
-        # Add headers to mimic browser request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        req = urllib.request.Request(url, headers=headers)
+        headers = {}
+        validators = cache.get(filepath.name, {}) if filepath.exists() else {}
+        if validators.get("etag"):
+            headers['If-None-Match'] = validators["etag"]
+        if validators.get("last_modified"):
+            headers['If-Modified-Since'] = validators["last_modified"]
         
-        with urllib.request.urlopen(req, timeout=30) as response:
-            with open(filepath, 'wb') as f:
-                f.write(response.read())
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304:
+                print(f"  ✓ {filepath.name} is up to date (not modified)\n")
+                return True
+            response.raise_for_status()
+            async with aiofiles.open(part_path, 'wb') as f:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    await f.write(chunk)
+        part_path.replace(filepath)
+        validators = {
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified')
+        }
+        if any(validators.values()):
+            cache[filepath.name] = validators
+        else:
+            cache.pop(filepath.name, None)
         
         file_size = filepath.stat().st_size
-        print(f"  ✓ Downloaded successfully ({file_size:,} bytes)\n")
+        print(f"  ✓ Downloaded {filepath.name} successfully ({file_size:,} bytes)\n")
         return True
         
     except Exception as e:
-        print(f"  ✗ Failed to download: {str(e)}\n")
+        part_path.unlink(missing_ok=True)
+        print(f"  ✗ Failed to download {filepath.name}: {str(e)}\n")
         return False
 
-def main():
+async def main():
     print("=" * 70)
     print("Downloading Sample PDFs for Document AI Testing")
     print("=" * 70)
@@ -67,20 +126,45 @@ def main():
     
     success_count = 0
     total_count = len(SAMPLES)
+    pending = []
+    cache = load_cache()
     
     for filename, info in SAMPLES.items():
         filepath = SAMPLE_DIR / filename
         
-        # Skip if already exists
-        if filepath.exists():
+        # Skip if already exists and there is nothing to revalidate against
+        validators = cache.get(filename) or {}
+        if filepath.exists() and not any(validators.values()):
             print(f"Skipping {filename} (already exists)")
             print()
             success_count += 1
             continue
         
-        # Download the file
-        if download_file(info["url"], filepath, info["description"]):
-            success_count += 1
+        pending.append((info["url"], filepath, info["description"]))
+    
+    # Download missing files and revalidate cached ones concurrently
+    if pending:
+        # One pooled connector for every download: requests to the same host
+        # (three samples live on arxiv.org) reuse a kept-alive TLS connection.
+        # Never send "Connection: close" here, it would defeat the pool.
+        connector = aiohttp.TCPConnector(
+            limit=8,
+            limit_per_host=4,
+            keepalive_timeout=30,
+            ttl_dns_cache=300
+        )
+        timeout = aiohttp.ClientTimeout(total=120)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers=REQUEST_HEADERS,
+            timeout=timeout
+        ) as session:
+            results = await asyncio.gather(*(
+                download_file(session, url, filepath, description, cache)
+                for url, filepath, description in pending
+            ))
+        success_count += sum(results)
+        save_cache(cache)
     
     print("=" * 70)
     print(f"Download Summary: {success_count}/{total_count} files downloaded successfully")
@@ -99,5 +183,5 @@ def main():
         print("See SAMPLE_SOURCES.md for manual download links.")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
 
@@ -3,9 +3,11 @@ Google Document AI Client with Layout Parser Processor
 Handles document processing using Google Cloud Document AI Layout Parser
 """
 
+import asyncio
 import os
+import re
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from google.cloud import documentai_v1 as documentai
 from google.api_core.client_options import ClientOptions
 from dotenv import load_dotenv
@@ -42,6 +44,12 @@ class DocumentAIClient:
         opts = ClientOptions(api_endpoint=f"{location}-documentai.googleapis.com")
         self.client = documentai.DocumentProcessorServiceClient(client_options=opts)
         
+        # Async client is created on first use, inside the running event loop.
+        # Its gRPC channel is bound to that loop, so it is rebuilt when the loop changes
+        self._client_options = opts
+        self._async_client = None
+        self._async_client_loop = None
+        
         # Build processor name
         self.processor_name = self.client.processor_path(
             project_id, location, processor_id
@@ -61,21 +69,134 @@ class DocumentAIClient:
         with open(file_path, "rb") as f:
             file_content = f.read()
         
-        # Configure request
+        request = self._build_process_request(file_content)
+        
+        # Process document
+        result = self.client.process_document(request=request)
+        
+        return result.document
+    
+    async def process_document_async(self, file_path: str) -> documentai.Document:
+        """
+        Process a document with Layout Parser without blocking the event loop
+        
+        Args:
+            file_path: Path to PDF file
+            
+        Returns:
+            Document AI Document object with layout analysis
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = documentai.DocumentProcessorServiceAsyncClient(
+                client_options=self._client_options
+            )
+            self._async_client_loop = loop
+        
+        file_content = await asyncio.to_thread(Path(file_path).read_bytes)
+        request = self._build_process_request(file_content)
+        
+        result = await self._async_client.process_document(request=request)
+        
+        return result.document
+    
+    async def process_documents_async(self, file_paths: List[str]) -> List[documentai.Document]:
+        """
+        Process several documents concurrently
+        
+        Args:
+            file_paths: Paths to PDF files
+            
+        Returns:
+            Documents in the same order as file_paths
+        """
+        return await asyncio.gather(
+            *(self.process_document_async(path) for path in file_paths)
+        )
+    
+    def _build_process_request(self, file_content: bytes) -> documentai.ProcessRequest:
+        """Build an online ProcessRequest for raw PDF bytes"""
         raw_document = documentai.RawDocument(
             content=file_content,
             mime_type="application/pdf"
         )
         
-        request = documentai.ProcessRequest(
+        return documentai.ProcessRequest(
             name=self.processor_name,
             raw_document=raw_document
         )
+    
+    def process_document_batch(
+        self,
+        gcs_uri: str,
+        gcs_output_prefix: str,
+        timeout: int = 600
+    ) -> List[documentai.Document]:
+        """
+        Process a PDF stored in Cloud Storage as a batch (long-running) request
         
-        # Process document
-        result = self.client.process_document(request=request)
+        Preferred for large files (> 20 MB): the PDF never passes through this
+        process, and Document AI can process the pages in parallel server-side.
         
-        return result.document
+        Args:
+            gcs_uri: gs:// URI of the input PDF
+            gcs_output_prefix: gs:// prefix where Document AI writes its results
+            timeout: Seconds to wait for the operation to finish
+            
+        Returns:
+            Document shards in page order (large documents are split into
+            several shards by Document AI)
+        """
+        from google.cloud import storage
+        
+        input_config = documentai.BatchDocumentsInputConfig(
+            gcs_documents=documentai.GcsDocuments(
+                documents=[
+                    documentai.GcsDocument(gcs_uri=gcs_uri, mime_type="application/pdf")
+                ]
+            )
+        )
+        output_config = documentai.DocumentOutputConfig(
+            gcs_output_config=documentai.DocumentOutputConfig.GcsOutputConfig(
+                gcs_uri=gcs_output_prefix
+            )
+        )
+        
+        request = documentai.BatchProcessRequest(
+            name=self.processor_name,
+            input_documents=input_config,
+            document_output_config=output_config
+        )
+        
+        # Wait for the long-running operation to complete
+        operation = self.client.batch_process_documents(request=request)
+        operation.result(timeout=timeout)
+        
+        metadata = documentai.BatchProcessMetadata(operation.metadata)
+        if metadata.state != documentai.BatchProcessMetadata.State.SUCCEEDED:
+            raise Exception(f"Batch processing failed: {metadata.state_message}")
+        
+        # Read the JSON shards written for our document
+        storage_client = storage.Client()
+        documents = []
+        for process in metadata.individual_process_statuses:
+            match = re.match(r"gs://(.*?)/(.*)", process.output_gcs_destination)
+            if not match:
+                continue
+            bucket_name, prefix = match.groups()
+            blobs = storage_client.list_blobs(bucket_name, prefix=prefix)
+            for blob in blobs:
+                if blob.content_type != "application/json":
+                    continue
+                documents.append(
+                    documentai.Document.from_json(
+                        blob.download_as_bytes(),
+                        ignore_unknown_fields=True
+                    )
+                )
+        
+        documents.sort(key=lambda doc: doc.shard_info.shard_index)
+        return documents
     
     def verify_setup(self) -> bool:
         """
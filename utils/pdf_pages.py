@@ -0,0 +1,300 @@
+"""
+PDF page rasterization shared by the parser and the vision utilities
+Renders in-process with pypdfium2 and falls back to pdf2image (poppler)
+when pypdfium2 is not installed.
+"""
+
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from PIL import Image
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None  # Render through pdf2image instead
+
+
+# Default resolution used when rasterizing PDF pages
+RENDER_DPI = 200
+
+# Rendered pages shared by every caller in this process (parser crops,
+# extract_image_from_pdf), LRU-evicted. A 200 DPI letter page is ~11 MB, and
+# pages outlive the parse that rendered them: call clear_page_cache() to free them.
+PAGE_CACHE_SIZE = 8
+_page_cache = OrderedDict()  # (pdf path, mtime, page_idx, dpi, fallback fmt) -> image
+_page_cache_lock = threading.Lock()
+
+
+def _page_key(pdf_path: str, page_idx: int, dpi: int, fmt: str) -> Tuple:
+    """
+    Cache key for a rendered page; the mtime keeps a replaced file from hitting stale pages.
+    fmt only changes the pixels under the pdf2image fallback (e.g. lossy "jpeg"),
+    so pypdfium2 renders are shared across formats.
+    """
+    try:
+        mtime = os.stat(pdf_path).st_mtime_ns
+    except OSError:
+        mtime = None  # Let the renderer report the missing file
+    return (os.path.realpath(pdf_path), mtime, page_idx, dpi, fmt if pdfium is None else None)
+
+
+def get_cached_page(pdf_path: str, page_idx: int, dpi: int = RENDER_DPI, fmt: str = "ppm") -> Optional[Image.Image]:
+    """Returns a previously rendered page from the shared cache, or None."""
+    key = _page_key(pdf_path, page_idx, dpi, fmt)
+    with _page_cache_lock:
+        image = _page_cache.get(key)
+        if image is not None:
+            _page_cache.move_to_end(key)
+        return image
+
+
+def cache_page(pdf_path: str, page_idx: int, dpi: int, image: Image.Image, fmt: str = "ppm"):
+    """Adds a rendered page to the shared cache, evicting the least recently used."""
+    key = _page_key(pdf_path, page_idx, dpi, fmt)
+    with _page_cache_lock:
+        _page_cache[key] = image
+        _page_cache.move_to_end(key)
+        while len(_page_cache) > PAGE_CACHE_SIZE:
+            _page_cache.popitem(last=False)
+
+
+def clear_page_cache():
+    """Releases every page held in the shared cache."""
+    with _page_cache_lock:
+        _page_cache.clear()
+
+
+def open_pdf(pdf_path: str):
+    """
+    Opens a PDF handle that render_page can reuse across pages.
+    Returns None when rendering through the pdf2image fallback.
+    """
+    return pdfium.PdfDocument(pdf_path) if pdfium else None
+
+
+def render_page(
+    pdf_path: str,
+    page_idx: int,
+    dpi: int = RENDER_DPI,
+    pdf=None,
+    fmt: str = "ppm"
+) -> Optional[Image.Image]:
+    """
+    Renders a single page
+
+    Args:
+        pdf_path: Path to PDF file
+        page_idx: Page number (0-indexed)
+        dpi: Render resolution
+        pdf: Handle from open_pdf to reuse (opened and closed per call if omitted)
+        fmt: Intermediate page format for pdftoppm (pdf2image fallback only)
+
+    Returns:
+        Page image, or None if the page does not exist
+    """
+    if page_idx < 0:
+        return None
+
+    image = get_cached_page(pdf_path, page_idx, dpi, fmt)
+    if image is None:
+        image = _render_uncached(pdf_path, page_idx, dpi, pdf, fmt)
+        if image is not None:
+            cache_page(pdf_path, page_idx, dpi, image, fmt)
+    return image
+
+
+def _render_uncached(pdf_path: str, page_idx: int, dpi: int, pdf, fmt: str) -> Optional[Image.Image]:
+    """Rasterizes a page with pypdfium2, or pdf2image when pypdfium2 is unavailable."""
+    if page_idx < 0:
+        return None
+
+    if pdfium is None:
+        from pdf2image import convert_from_path
+
+        images = convert_from_path(
+            pdf_path,
+            first_page=page_idx + 1,
+            last_page=page_idx + 1,
+            dpi=dpi,
+            fmt=fmt
+        )
+        if not images:
+            return None
+        # pdf2image returns lazily decoded images; decode now so threads cropping
+        # the same page never read its file handle concurrently
+        image = images[0]
+        image.load()
+        return image
+
+    # pdfium renders in-process (no poppler subprocess / PPM round-trip)
+    document = pdf if pdf is not None else pdfium.PdfDocument(pdf_path)
+    try:
+        if page_idx >= len(document):
+            return None
+        page = document[page_idx]
+        try:
+            return page.render(scale=dpi / 72).to_pil()
+        finally:
+            page.close()
+    finally:
+        if pdf is None:
+            document.close()
+
+
+def render_pages(pdf_path: str, page_indices: List[int], dpi: int = RENDER_DPI) -> List[Optional[Image.Image]]:
+    """
+    Renders the given pages (0-indexed) with one PDF handle; None for missing pages.
+    Bypasses the shared cache, so render-pool workers do not hold pages of their own;
+    rasterize_parallel caches the results in the calling process.
+    """
+    pdf = open_pdf(pdf_path)
+    try:
+        return [_render_uncached(pdf_path, page_idx, dpi, pdf, "ppm") for page_idx in page_indices]
+    finally:
+        if pdf is not None:
+            pdf.close()
+
+
+def create_render_pool(n_workers: Optional[int] = None) -> Optional[ProcessPoolExecutor]:
+    """
+    Starts a process pool for rasterize_parallel, meant to be reused across calls.
+    Returns None when only one worker would run: rendering in-process is then faster.
+    Workers come from a forkserver where available, so they are never forked from a
+    parent that already runs threads (e.g. the parser's I/O pool). Like spawn, that
+    re-imports the caller's __main__ in each worker, so scripts must start the pool
+    under an `if __name__ == "__main__":` guard.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers <= 1:
+        return None
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context("forkserver"))
+    return ProcessPoolExecutor(max_workers=n_workers)
+
+
+def rasterize_parallel(
+    pdf_path: str,
+    page_indices: List[int],
+    dpi: int = RENDER_DPI,
+    n_workers: Optional[int] = None,
+    executor: Optional[ProcessPoolExecutor] = None
+) -> Dict[int, Optional[Image.Image]]:
+    """
+    Renders pages across worker processes, each handling a contiguous share of them.
+    pdfium is not thread-safe, but separate processes each get their own library state.
+    Pass an executor from create_render_pool to reuse its workers; otherwise a pool is
+    started and shut down for this call.
+    Pages already in the shared cache are not re-rendered; new renders are added to it.
+    Returns {page_idx: image}.
+    """
+    rendered = {}
+    pages = []
+    for page_idx in sorted(set(page_indices)):
+        image = get_cached_page(pdf_path, page_idx, dpi)
+        if image is not None:
+            rendered[page_idx] = image
+        else:
+            pages.append(page_idx)
+    if not pages:
+        return rendered
+
+    n_workers = min(n_workers or os.cpu_count() or 1, len(pages))
+    if n_workers <= 1:
+        _collect_renders(pdf_path, dpi, [pages], [render_pages(pdf_path, pages, dpi)], rendered)
+        return rendered
+
+    share = -(-len(pages) // n_workers)  # ceiling division
+    shares = [pages[i:i + share] for i in range(0, len(pages), share)]
+    if executor is not None:
+        results = executor.map(render_pages, [pdf_path] * len(shares), shares, [dpi] * len(shares))
+        _collect_renders(pdf_path, dpi, shares, results, rendered)
+        return rendered
+    with ProcessPoolExecutor(max_workers=len(shares)) as executor:
+        results = executor.map(render_pages, [pdf_path] * len(shares), shares, [dpi] * len(shares))
+        _collect_renders(pdf_path, dpi, shares, results, rendered)
+    return rendered
+
+
+def _collect_renders(pdf_path: str, dpi: int, shares, results, rendered: Dict[int, Optional[Image.Image]]):
+    """Adds each worker's pages to rendered and the shared cache."""
+    for share_pages, images in zip(shares, results):
+        for page_idx, image in zip(share_pages, images):
+            rendered[page_idx] = image
+            if image is not None:
+                cache_page(pdf_path, page_idx, dpi, image)
+
+
+class PageImageCache:
+    """
+    Renders PDF pages on first access and keeps the most recently used ones in memory.
+    Indexed by 0-based page number; raises KeyError for pages that do not exist
+    or could not be rendered.
+    """
+
+    def __init__(self, pdf_path: str, dpi: int = RENDER_DPI, maxsize: int = 8):
+        """
+        Args:
+            pdf_path: Path to the PDF file
+            dpi: Render resolution
+            maxsize: Maximum number of rendered pages kept in memory
+        """
+        self.pdf_path = pdf_path
+        self.dpi = dpi
+        self.maxsize = maxsize
+        self._pdf = None
+        self._pages = OrderedDict()  # page_idx -> image (None if it could not be rendered)
+
+    def __getitem__(self, page_idx: int) -> Image.Image:
+        if page_idx in self._pages:
+            self._pages.move_to_end(page_idx)
+            image = self._pages[page_idx]
+        else:
+            image = self._render(page_idx)
+            self._store(page_idx, image)
+        if image is None:
+            raise KeyError(page_idx)
+        return image
+
+    def warm(self, page_indices: List[int], executor: Optional[ProcessPoolExecutor] = None):
+        """
+        Renders missing pages (up to maxsize of them) in parallel worker processes.
+        Pass an executor from create_render_pool to reuse its workers across calls.
+        """
+        missing = [idx for idx in dict.fromkeys(page_indices) if idx >= 0 and idx not in self._pages]
+        if not missing:
+            return
+        try:
+            rendered = rasterize_parallel(self.pdf_path, missing[:self.maxsize], self.dpi, executor=executor)
+        except Exception as e:
+            # Pages are still rendered one by one on access
+            print(f"Warning: Parallel page rendering failed ({e}). Rendering pages one by one.")
+            return
+        for page_idx, image in rendered.items():
+            self._store(page_idx, image)
+
+    def close(self):
+        """Drops rendered pages and closes the PDF handle."""
+        self._pages.clear()
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+    def _render(self, page_idx: int) -> Optional[Image.Image]:
+        """Renders a single page in-process, or returns None if that fails."""
+        try:
+            if self._pdf is None:
+                self._pdf = open_pdf(self.pdf_path)
+            return render_page(self.pdf_path, page_idx, self.dpi, pdf=self._pdf)
+        except Exception as e:
+            print(f"Warning: Could not load PDF page {page_idx + 1} ({e}). Its images will be skipped.")
+        return None
+
+    def _store(self, page_idx: int, image: Optional[Image.Image]):
+        self._pages[page_idx] = image
+        self._pages.move_to_end(page_idx)
+        while len(self._pages) > self.maxsize:
+            self._pages.popitem(last=False)
@@ -3,11 +3,24 @@ Table conversion utilities for Document AI Layout Parser
 Converts tables to markdown and narrative paragraphs using LLM
 """
 
+import asyncio
 import os
+import re
+from functools import lru_cache
+from itertools import chain
 from typing import List, Optional
 from dotenv import load_dotenv
 
 
+# Read .env once at import instead of on every conversion
+load_dotenv()
+
+
+# Keyword patterns for detect_table_type (substring matches, case-insensitive)
+_TIME_SERIES_RE = re.compile(r'year|month|quarter|date|time|period|q[1-4]', re.IGNORECASE)
+_SUMMARY_RE = re.compile(r'total|sum|average|mean|summary', re.IGNORECASE)
+
+
 def table_to_markdown(table_data: List[List[str]]) -> str:
     """
     Convert 2D table data to markdown format
@@ -21,20 +34,14 @@ def table_to_markdown(table_data: List[List[str]]) -> str:
     if not table_data or len(table_data) == 0:
         return ""
     
-    markdown_lines = []
-    
-    # Header row
-    header = "| " + " | ".join(table_data[0]) + " |"
-    markdown_lines.append(header)
-    
-    # Separator row
-    separator = "| " + " | ".join(["---"] * len(table_data[0])) + " |"
-    markdown_lines.append(separator)
+    # Header and separator rows
+    markdown_lines = [
+        f"| {' | '.join(table_data[0])} |",
+        f"| {' | '.join(['---'] * len(table_data[0]))} |"
+    ]
     
     # Data rows
-    for row in table_data[1:]:
-        row_str = "| " + " | ".join(row) + " |"
-        markdown_lines.append(row_str)
+    markdown_lines.extend(f"| {' | '.join(row)} |" for row in table_data[1:])
     
     return "\n".join(markdown_lines)
 
@@ -53,21 +60,17 @@ def detect_table_type(table_data: List[List[str]]) -> str:
         return "data"
     
     # Check for time-series indicators in first column
-    first_column = [row[0].lower() if row else "" for row in table_data]
-    time_keywords = ['year', 'month', 'quarter', 'date', 'time', 'period', 'q1', 'q2', 'q3', 'q4']
+    first_column_text = " ".join(row[0] for row in table_data if row)
     
-    if any(keyword in " ".join(first_column) for keyword in time_keywords):
+    if _TIME_SERIES_RE.search(first_column_text):
         return "time-series"
     
     # Check for comparison indicators (multiple similar columns)
     if len(table_data[0]) > 2:
         return "comparison"
     
-    # Check for summary indicators (totals, averages)
-    all_text = " ".join([" ".join(row) for row in table_data]).lower()
-    summary_keywords = ['total', 'sum', 'average', 'mean', 'summary']
-    
-    if any(keyword in all_text for keyword in summary_keywords):
+    # Check for summary indicators (totals, averages), stopping at the first hit
+    if any(_SUMMARY_RE.search(cell) for row in table_data for cell in row):
         return "summary"
     
     return "data"
@@ -84,8 +87,6 @@ def table_to_narrative(markdown: str, method: str = "auto") -> str:
     Returns:
         Narrative paragraph describing the table
     """
-    load_dotenv()
-    
     provider = os.getenv("LLM_PROVIDER", "openai")
     
     if provider == "openai":
@@ -96,60 +97,130 @@ def table_to_narrative(markdown: str, method: str = "auto") -> str:
 
 def _convert_with_openai(markdown: str, method: str) -> str:
     """Convert table to narrative using OpenAI"""
-    from openai import OpenAI
-    
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OPENAI_API_KEY not set in environment")
     
-    client = OpenAI(api_key=api_key)
+    client = _get_openai_client(api_key)
     
-    prompt = _build_conversion_prompt(markdown, method)
-    
-    response = client.chat.completions.create(
-        model=os.getenv("LLM_MODEL", "gpt-4o"),
-        messages=[
-            {
-                "role": "system",
-                "content": "You are a helpful assistant that converts tables to clear, readable narrative paragraphs. Preserve all key information from the table."
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        temperature=0.3,
-        max_tokens=500
-    )
+    response = client.chat.completions.create(**_openai_request(markdown, method))
     
     return response.choices[0].message.content.strip()
 
 
 def _convert_with_anthropic(markdown: str, method: str) -> str:
     """Convert table to narrative using Anthropic Claude"""
-    from anthropic import Anthropic
-    
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         raise ValueError("ANTHROPIC_API_KEY not set in environment")
     
-    client = Anthropic(api_key=api_key)
+    client = _get_anthropic_client(api_key)
     
-    prompt = _build_conversion_prompt(markdown, method)
+    response = client.messages.create(**_anthropic_request(markdown, method))
     
-    response = client.messages.create(
-        model="claude-3-5-sonnet-20241022",
-        max_tokens=500,
-        temperature=0.3,
-        messages=[
+    return response.content[0].text.strip()
+
+
+@lru_cache(maxsize=1)
+def _get_openai_client(api_key: str):
+    """Shared OpenAI client, so its HTTP connection pool is reused across calls"""
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=1)
+def _get_anthropic_client(api_key: str):
+    """Shared Anthropic client, so its HTTP connection pool is reused across calls"""
+    from anthropic import Anthropic
+    return Anthropic(api_key=api_key)
+
+
+async def table_to_narrative_batch(
+    markdowns: List[str],
+    method: str = "auto",
+    concurrency: int = 8
+) -> List[str]:
+    """
+    Convert several markdown tables to narrative paragraphs concurrently
+    
+    Args:
+        markdowns: Markdown formatted tables
+        method: Table type hint applied to every table
+        concurrency: Maximum number of LLM requests in flight (rate limiting)
+        
+    Returns:
+        Narrative paragraphs in the same order as markdowns
+    """
+    provider = os.getenv("LLM_PROVIDER", "openai")
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    # One client per batch so every request shares its connection pool
+    if provider == "openai":
+        from openai import AsyncOpenAI
+        
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not set in environment")
+        
+        async with AsyncOpenAI(api_key=api_key) as client:
+            async def convert(markdown: str) -> str:
+                async with semaphore:
+                    response = await client.chat.completions.create(
+                        **_openai_request(markdown, method)
+                    )
+                return response.choices[0].message.content.strip()
+            
+            return list(await asyncio.gather(*(convert(md) for md in markdowns)))
+    else:
+        from anthropic import AsyncAnthropic
+        
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            raise ValueError("ANTHROPIC_API_KEY not set in environment")
+        
+        async with AsyncAnthropic(api_key=api_key) as client:
+            async def convert(markdown: str) -> str:
+                async with semaphore:
+                    response = await client.messages.create(
+                        **_anthropic_request(markdown, method)
+                    )
+                return response.content[0].text.strip()
+            
+            return list(await asyncio.gather(*(convert(md) for md in markdowns)))
+
+
+def _openai_request(markdown: str, method: str) -> dict:
+    """Build chat.completions.create arguments for table conversion"""
+    return {
+        "model": os.getenv("LLM_MODEL", "gpt-4o"),
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a helpful assistant that converts tables to clear, readable narrative paragraphs. Preserve all key information from the table."
+            },
             {
                 "role": "user",
-                "content": prompt
+                "content": _build_conversion_prompt(markdown, method)
+            }
+        ],
+        "temperature": 0.3,
+        "max_tokens": 500
+    }
+
+
+def _anthropic_request(markdown: str, method: str) -> dict:
+    """Build messages.create arguments for table conversion"""
+    return {
+        "model": "claude-3-5-sonnet-20241022",
+        "max_tokens": 500,
+        "temperature": 0.3,
+        "messages": [
+            {
+                "role": "user",
+                "content": _build_conversion_prompt(markdown, method)
             }
         ]
-    )
-    
-    return response.content[0].text.strip()
+    }
 
 
 def _build_conversion_prompt(markdown: str, method: str) -> str:
@@ -191,46 +262,45 @@ def extract_table_data(table, full_text):
     Returns:
         2D list of cell values
     """
-    cells_dict = {}
-    max_row = 0
-    max_col = 0
-    
-    # Extract all cells
-    all_cells = []
-    if hasattr(table, 'header_rows'):
-        for row in table.header_rows:
-            all_cells.extend(row.cells)
-    if hasattr(table, 'body_rows'):
-        for row in table.body_rows:
-            all_cells.extend(row.cells)
-    
-    # Build cell grid
-    for cell in all_cells:
+    # Walk header and body cells in a single pass, collecting positions and text
+    all_rows = chain(
+        getattr(table, 'header_rows', None) or [],
+        getattr(table, 'body_rows', None) or []
+    )
+    row_indices = []
+    col_indices = []
+    cell_texts = []
+    for cell in chain.from_iterable(row.cells for row in all_rows):
         if not hasattr(cell, 'layout') or not cell.layout.text_anchor:
             continue
         
         row_idx = getattr(cell.layout, 'table_row_index', 0)
         col_idx = getattr(cell.layout, 'table_col_index', 0)
         
-        # Get cell text
-        text_parts = []
-        for segment in cell.layout.text_anchor.text_segments:
-            text = full_text[segment.start_index:segment.end_index]
-            text_parts.append(text)
+        # Get cell text (single-segment anchors are sliced directly)
+        text_segments = cell.layout.text_anchor.text_segments
+        if len(text_segments) == 1:
+            segment = text_segments[0]
+            cell_text = full_text[segment.start_index:segment.end_index]
+        else:
+            text_parts = []
+            for segment in text_segments:
+                text = full_text[segment.start_index:segment.end_index]
+                text_parts.append(text)
+            cell_text = " ".join(text_parts)
         
-        cell_text = " ".join(text_parts).strip()
-        cells_dict[(row_idx, col_idx)] = cell_text
-        max_row = max(max_row, row_idx)
-        max_col = max(max_col, col_idx)
+        row_indices.append(row_idx)
+        col_indices.append(col_idx)
+        cell_texts.append(cell_text.strip())
     
-    # Convert to 2D list
-    if not cells_dict:
+    if not cell_texts:
         return []
     
-    table_data = []
-    for row in range(max_row + 1):
-        row_data = [cells_dict.get((row, col), "") for col in range(max_col + 1)]
-        table_data.append(row_data)
+    # Fill a pre-sized 2D list (missing cells stay empty)
+    num_cols = max(col_indices) + 1
+    table_data = [[""] * num_cols for _ in range(max(row_indices) + 1)]
+    for row_idx, col_idx, cell_text in zip(row_indices, col_indices, cell_texts):
+        table_data[row_idx][col_idx] = cell_text
     
     return table_data
 
@@ -7,12 +7,62 @@ the Block/Document classes are not directly importable from documentai_v1.
 They exist dynamically in the API response objects.
 """
 
+import json
 import os
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from google.cloud import documentai_v1 as documentai
-from pdf2image import convert_from_path
 from PIL import Image
 
+from .pdf_pages import PageImageCache, create_render_pool
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Serialize with the standard json module instead
+
+
+# Crops of the same format whose pixel boxes agree within this many pixels are saved only once
+CROP_DEDUP_PX = 4
+
+# text_block types that are treated as visual content and cropped
+VISUAL_BLOCK_TYPES = frozenset({"image", "figure", "chart", "diagram", "Figure", "Image"})
+
+# Crop types saved as JPEG in fast_mode (diagrams and charts stay lossless PNG)
+FAST_MODE_JPEG_TYPES = frozenset({"image", "figure", "Figure", "Image"})
+JPEG_QUALITY = 85
+
+
+def _bbox_extents(vertices) -> Tuple[float, float, float, float]:
+    """
+    Returns (min_x, min_y, max_x, max_y) of a non-empty vertex sequence in a single pass.
+    Shared by bbox normalization and crop planning.
+    """
+    vertex_iter = iter(vertices)
+    v = next(vertex_iter)
+    x_min = x_max = getattr(v, 'x', 0) or 0
+    y_min = y_max = getattr(v, 'y', 0) or 0
+    for v in vertex_iter:
+        x = getattr(v, 'x', 0) or 0
+        y = getattr(v, 'y', 0) or 0
+        if x < x_min:
+            x_min = x
+        elif x > x_max:
+            x_max = x
+        if y < y_min:
+            y_min = y
+        elif y > y_max:
+            y_max = y
+    return x_min, y_min, x_max, y_max
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serializes obj to compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 
 class UniversalParser:
     """
@@ -23,19 +73,43 @@ class UniversalParser:
     3. Visual Content (Images/Charts extracted as files)
     """
 
-    def __init__(self, docai_client, output_dir: str = "output"):
+    def __init__(
+        self,
+        docai_client,
+        output_dir: str = "output",
+        fast_mode: bool = False,
+        render_workers: int = 0
+    ):
         """
         Args:
             docai_client: Instance of DocumentAIClient
             output_dir: Directory to save extracted images and results
+            fast_mode: Save photo-like crops (image/figure) as JPEG instead of PNG
+            render_workers: Render pages in this many worker processes (0 or 1: in-process).
+                Workers re-import the calling script, so scripts that enable this must
+                call parse() under an `if __name__ == "__main__":` guard
         """
         self.client = docai_client
-        self.output_dir = output_dir
-        self.images_dir = os.path.join(output_dir, "images")
+        self.fast_mode = fast_mode
+        self.render_workers = render_workers
+        self.output_dir = Path(output_dir)
+        self.images_dir = self.output_dir / "images"
         
-        # Create output directories
-        os.makedirs(self.output_dir, exist_ok=True)
-        os.makedirs(self.images_dir, exist_ok=True)
+        # Create output directories (once, not per saved crop)
+        self.images_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Document text, resolved once per parse for text_anchor slicing
+        self._full_text = ""
+        self._full_text_len = 0
+        
+        # Tree position -> saved crop path, filled before the structural traversal.
+        # Keyed by position (child indices from the root), not block_id: ids can be
+        # missing or repeated, and proto-plus returns a new wrapper object on every
+        # access, so the pre-pass and the traversal never share block objects
+        self._crop_paths = {}
+        
+        # Crop file paths already claimed in the current parse
+        self._claimed_save_paths = set()
 
     def parse(self, pdf_path: str) -> Dict[str, Any]:
         """
@@ -47,55 +121,127 @@ class UniversalParser:
         Returns:
             Dictionary containing the hierarchical document structure
         """
+        metadata, root_blocks = self._prepare(pdf_path)
+        
+        result = {
+            "metadata": metadata,
+            "structure": list(self._iter_top_level_nodes(root_blocks))
+        }
+        
+        return result
+
+    def parse_to_json(self, pdf_path: str, out_file: str) -> Dict[str, Any]:
+        """
+        Parses a PDF and writes the same JSON that parse() returns (compact) to out_file.
+        Top-level nodes are serialized as soon as their subtree is built, so the
+        whole tree is never held in memory. Uses orjson when installed.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            out_file: Path of the JSON file to write
+            
+        Returns:
+            The document metadata
+        """
+        metadata, root_blocks = self._prepare(pdf_path)
+        
+        with open(out_file, "wb") as f:
+            f.write(b'{"metadata":' + _dumps(metadata) + b',"structure":[')
+            separator = b""
+            for node in self._iter_top_level_nodes(root_blocks):
+                f.write(separator + _dumps(node))
+                separator = b","
+            f.write(b"]}")
+        
+        return metadata
+
+    def _prepare(self, pdf_path: str) -> Tuple[Dict[str, Any], List[Any]]:
+        """
+        Runs Document AI on the PDF and saves the crops of its visual blocks.
+        Returns (metadata, root_blocks), ready for _iter_top_level_nodes.
+        """
         print(f"Processing document: {pdf_path}")
         
         # 1. Process with Document AI
         doc = self.client.process_document(pdf_path)
         
-        # 2. Load PDF pages as images (for cropping visuals)
-        print("Loading PDF pages for image extraction...")
-        try:
-            page_images = convert_from_path(pdf_path)
-        except Exception as e:
-            print(f"Warning: Could not load PDF images ({e}). Image extraction will be skipped.")
-            page_images = []
-
-        # 3. Get the full document text (used for text_anchor extraction)
+        # 2. Get the full document text (used for text_anchor extraction)
         full_text = getattr(doc, 'text', '') or ''
+        self._full_text = full_text
+        self._full_text_len = len(full_text)
 
-        # 4. Begin Recursive Parsing from the Layout root
         # Layout Parser results are in doc.document_layout.blocks
         root_blocks = []
         if hasattr(doc, 'document_layout') and doc.document_layout:
             root_blocks = getattr(doc.document_layout, 'blocks', []) or []
         
-        parsed_structure = []
-        for block in root_blocks:
-            node = self._visit_block(block, full_text, page_images, pdf_path)
-            if node:
-                parsed_structure.append(node)
+        # 3. Crop and save every visual block up front, page by page.
+        # Pages are rasterized lazily, only for blocks that need a crop;
+        # text-only documents never open the PDF for rendering at all
+        self._crop_paths = {}
+        self._claimed_save_paths = set()
+        image_blocks = self._collect_image_blocks(root_blocks)
+        if image_blocks:
+            page_images = PageImageCache(pdf_path)
+            try:
+                self._process_crops(image_blocks, page_images)
+            finally:
+                # Close the PDF handle and drop this parse's page references. Rendered
+                # pages stay in the shared pdf_pages cache (up to PAGE_CACHE_SIZE) for
+                # extract_image_from_pdf; long-running callers can free them with
+                # pdf_pages.clear_page_cache()
+                page_images.close()
         
-        # 5. Get page count safely
+        # 4. Get page count safely
         page_count = len(doc.pages) if hasattr(doc, 'pages') and doc.pages else 0
-                
-        result = {
-            "metadata": {
-                "filename": os.path.basename(pdf_path),
-                "page_count": page_count,
-                "text_length": len(full_text)
-            },
-            "structure": parsed_structure
-        }
         
-        return result
+        metadata = {
+            "filename": os.path.basename(pdf_path),
+            "page_count": page_count,
+            "text_length": len(full_text)
+        }
+        return metadata, root_blocks
 
-    def _visit_block(self, block, full_text: str, page_images: List[Image.Image], pdf_path: str) -> Optional[Dict[str, Any]]:
+    def _iter_top_level_nodes(self, root_blocks) -> Iterator[Dict[str, Any]]:
         """
-        Recursively processes a block and its children.
+        Walks the block tree from the Layout root, yielding each top-level node
+        once its whole subtree is built. Expects _prepare to have run.
+        """
+        try:
+            for root_idx, root_block in enumerate(root_blocks):
+                # Depth-first with an explicit stack of (parent's children list, block, position):
+                # no Python recursion, so deeply nested documents cannot hit the recursion limit
+                top_level = []
+                stack = [(top_level, root_block, (root_idx,))]
+                while stack:
+                    siblings, block, position = stack.pop()
+                    visited = self._node_from_block(block, position)
+                    if visited is None:
+                        continue
+                    node, child_blocks = visited
+                    siblings.append(node)
+                    # Push children reversed so they are visited (and appended) in document order
+                    stack.extend(
+                        (node["children"], child, position + (child_idx,))
+                        for child_idx, child in reversed(list(enumerate(child_blocks)))
+                    )
+                if top_level:
+                    yield top_level[0]
+        finally:
+            self._crop_paths = {}
+
+    def _node_from_block(self, block, position: Tuple[int, ...] = ()) -> Optional[Tuple[Dict[str, Any], List[Any]]]:
+        """
+        Builds the node for a single block, without descending into its children.
+        position is the block's tree position, used to look up its saved crop.
+        Returns (node, child_blocks) where child_blocks still need to be visited,
+        or None for empty/unknown blocks.
         Uses defensive attribute access to handle API variations.
         """
-        # 1. Identify Block Type
-        block_type = self._get_block_type(block)
+        # 1. Identify Block Type (content fields are resolved once and reused below)
+        parts = self._get_block_parts(block)
+        table_block, image_block, list_block, text_block = parts
+        block_type = self._get_block_type(block, parts)
         
         # 2. Get block ID safely
         block_id = getattr(block, 'block_id', None) or "unknown"
@@ -124,28 +270,24 @@ class UniversalParser:
         # 6. Handle Content based on Type
         
         # CASE A: TABLES
-        table_block = getattr(block, 'table_block', None)
         if table_block:
             node["type"] = "table"
             # Pass the full block to access child text blocks for spatial mapping
-            node["data"] = self._extract_table_grid(block, full_text)
-            return node
+            node["data"] = self._extract_table_grid(block)
+            return node, []
 
         # CASE B: IMAGES / CHARTS
-        image_block = getattr(block, 'image_block', None)
-        text_block = getattr(block, 'text_block', None)
-        
-        if image_block or (text_block and block_type in ["image", "figure", "chart", "diagram", "Figure", "Image"]):
-            node["type"] = block_type if block_type not in ["unknown"] else "image"
+        visual_type = self._get_visual_type(parts, block_type)
+        if visual_type:
+            node["type"] = visual_type
             
-            if page_images:
-                image_path = self._save_crop(block, page_images)
-                if image_path:
-                    node["file_path"] = image_path
-            return node
+            # Crops were saved by _process_crops before traversal
+            file_path = self._crop_paths.get(position)
+            if file_path:
+                node["file_path"] = file_path
+            return node, []
 
         # CASE C: LISTS
-        list_block = getattr(block, 'list_block', None)
         if list_block:
             node["type"] = "list"
             # Fall through to text block handling below for content
@@ -154,7 +296,7 @@ class UniversalParser:
         if text_block:
             # Extract text: Priority 1: text_anchor (if full_text exists), Priority 2: text_block.text
             text_anchor = getattr(layout, 'text_anchor', None) if layout else None
-            extracted_text = self._get_text(text_anchor, full_text)
+            extracted_text = self._get_text(text_anchor)
             
             # Fallback to block.text_block.text if anchor extraction failed (e.g. empty full_text)
             if not extracted_text:
@@ -162,30 +304,38 @@ class UniversalParser:
                 
             node["text"] = extracted_text.strip()
             
-            # --- RECURSION ---
             # Layout Parser blocks can be nested inside text_block.blocks
             child_blocks = getattr(text_block, 'blocks', None) or []
-            for child_block in child_blocks:
-                child_node = self._visit_block(child_block, full_text, page_images, pdf_path)
-                if child_node:
-                    node["children"].append(child_node)
             
-            return node
+            return node, child_blocks
             
         return None  # Skip empty/unknown blocks
 
-    def _get_block_type(self, block) -> str:
-        """Determines the semantic type of the block using defensive attribute access."""
+    def _get_block_parts(self, block) -> Tuple[Any, Any, Any, Any]:
+        """Returns (table_block, image_block, list_block, text_block), None where absent."""
+        return (
+            getattr(block, 'table_block', None),
+            getattr(block, 'image_block', None),
+            getattr(block, 'list_block', None),
+            getattr(block, 'text_block', None)
+        )
+
+    def _get_block_type(self, block, parts: Optional[Tuple[Any, Any, Any, Any]] = None) -> str:
+        """
+        Determines the semantic type of the block using defensive attribute access.
+        Pass parts from _get_block_parts to avoid resolving the fields again.
+        """
+        table_block, image_block, list_block, text_block = parts or self._get_block_parts(block)
+        
         # Check for specific block types
-        if getattr(block, 'table_block', None):
+        if table_block:
             return "table"
-        if getattr(block, 'image_block', None):
+        if image_block:
             return "image"
-        if getattr(block, 'list_block', None):
+        if list_block:
             return "list"
         
         # Check text_block.type_ for semantic type (heading, paragraph, etc.)
-        text_block = getattr(block, 'text_block', None)
         if text_block:
             type_value = getattr(text_block, 'type_', None)
             if type_value:
@@ -194,25 +344,41 @@ class UniversalParser:
             
         return "unknown"
 
-    def _get_text(self, text_anchor, full_text: str) -> str:
-        """Extracts text from the document string using the anchor segments."""
+    def _get_visual_type(self, parts: Tuple[Any, Any, Any, Any], block_type: str) -> Optional[str]:
+        """Returns the node type for blocks that are cropped as images, None for all others."""
+        table_block, image_block, _, text_block = parts
+        if table_block:
+            return None
+        if image_block or (text_block and block_type in VISUAL_BLOCK_TYPES):
+            return block_type if block_type != "unknown" else "image"
+        return None
+
+    def _get_text(self, text_anchor) -> str:
+        """Extracts text from the current document's text using the anchor segments."""
+        full_text = self._full_text
         if not text_anchor or not full_text:
             return ""
+        text_len = self._full_text_len
         
         text_segments = getattr(text_anchor, 'text_segments', None) or []
         if not text_segments:
             return ""
+        
+        # start_index / end_index are int64 proto fields: already Python ints, 0 when unset
+        
+        # Fast path: most anchors have a single segment
+        if len(text_segments) == 1:
+            segment = text_segments[0]
+            start = segment.start_index
+            end = segment.end_index
+            if start < end <= text_len:
+                return full_text[start:end].strip()
+            return ""
             
-        extracted_text = ""
-        for segment in text_segments:
-            start = int(getattr(segment, 'start_index', 0) or 0)
-            end = int(getattr(segment, 'end_index', 0) or 0)
-            if end > start and end <= len(full_text):
-                extracted_text += full_text[start:end]
-            
-        return extracted_text.strip()
+        spans = [(segment.start_index, segment.end_index) for segment in text_segments]
+        return "".join([full_text[start:end] for start, end in spans if start < end <= text_len]).strip()
 
-    def _extract_table_grid(self, block, full_text: str) -> Dict[str, Any]:
+    def _extract_table_grid(self, block) -> Dict[str, Any]:
         """
         Reconstructs the table into a structured grid format.
         Handles missing full_text by matching child blocks to cells spatially.
@@ -221,29 +387,34 @@ class UniversalParser:
         if not table_block:
             return {"structured_rows": [], "simple_matrix": []}
 
+        # structured_rows and the simple 2D text matrix are built in the same pass
         rows_data = []
+        simple_matrix = []
+        has_full_text = bool(self._full_text)
         
-        # Combine header and body rows safely
-        header_rows = list(getattr(table_block, 'header_rows', []) or [])
-        body_rows = list(getattr(table_block, 'body_rows', []) or [])
-        all_rows = header_rows + body_rows
+        # Combine header and body rows safely (one tuple, no intermediate lists)
+        all_rows = (
+            *(getattr(table_block, 'header_rows', []) or []),
+            *(getattr(table_block, 'body_rows', []) or [])
+        )
 
         for row in all_rows:
             row_cells = []
+            row_texts = []
             cells = getattr(row, 'cells', []) or []
             for cell in cells:
                 cell_text = ""
                 cell_layout = getattr(cell, 'layout', None)
                 
                 # Method 1: Try text anchor (works when document.text is populated)
-                if full_text and cell_layout:
+                if has_full_text and cell_layout:
                     cell_text_anchor = getattr(cell_layout, 'text_anchor', None)
-                    cell_text = self._get_text(cell_text_anchor, full_text)
+                    cell_text = self._get_text(cell_text_anchor)
                 
                 # Method 2: Direct cell.blocks extraction (Layout Parser stores text here)
                 # Layout Parser returns empty document.text and stores cell content in cell.blocks[].text_block.text
                 if not cell_text:
-                    cell_blocks = list(getattr(cell, 'blocks', []) or [])
+                    cell_blocks = getattr(cell, 'blocks', []) or []
                     block_texts = []
                     for child_block in cell_blocks:
                         child_tb = getattr(child_block, 'text_block', None)
@@ -253,18 +424,15 @@ class UniversalParser:
                                 block_texts.append(text.strip())
                     cell_text = " ".join(block_texts)
 
-                cell_info = {
-                    "text": cell_text.strip(),
+                cell_text = cell_text.strip()
+                row_cells.append({
+                    "text": cell_text,
                     "row_span": getattr(cell, 'row_span', 1) or 1,
                     "col_span": getattr(cell, 'col_span', 1) or 1
-                }
-                row_cells.append(cell_info)
+                })
+                row_texts.append(cell_text)
             rows_data.append(row_cells)
-
-        # Create a simple 2D text matrix for easier reading
-        simple_matrix = []
-        for row in rows_data:
-            simple_matrix.append([cell["text"] for cell in row])
+            simple_matrix.append(row_texts)
 
         return {
             "structured_rows": rows_data,
@@ -289,9 +457,118 @@ class UniversalParser:
         return (ox0 <= cx <= ox1) and (oy0 <= cy <= oy1)
 
 
-    def _save_crop(self, block, page_images: List[Image.Image]) -> Optional[str]:
+    def _get_page_index(self, block) -> int:
+        """Returns the 0-indexed page a block starts on."""
+        page_span = getattr(block, 'page_span', None)
+        page_start = getattr(page_span, 'page_start', 1) if page_span else 1
+        return page_start - 1
+
+    def _collect_image_blocks(self, blocks) -> Dict[int, List[Tuple[Tuple[int, ...], Any, str]]]:
         """
-        Crops the region from the page image and saves it to disk.
+        Walks the block tree once and groups the visual blocks by 0-indexed page,
+        as (tree position, block, node type). Descends exactly where _node_from_block
+        does: into text blocks, but not into tables or visual blocks.
+        """
+        blocks_by_page = {}
+        stack = [((idx,), block) for idx, block in reversed(list(enumerate(blocks)))]
+        while stack:
+            position, block = stack.pop()
+            parts = self._get_block_parts(block)
+            visual_type = self._get_visual_type(parts, self._get_block_type(block, parts))
+            if visual_type:
+                blocks_by_page.setdefault(self._get_page_index(block), []).append((position, block, visual_type))
+                continue
+            table_block, _, _, text_block = parts
+            if text_block and not table_block:
+                child_blocks = getattr(text_block, 'blocks', None) or []
+                stack.extend(
+                    (position + (child_idx,), child)
+                    for child_idx, child in reversed(list(enumerate(child_blocks)))
+                )
+        return blocks_by_page
+
+    def _process_crops(self, blocks_by_page: Dict[int, List[Tuple[Tuple[int, ...], Any, str]]], page_images: PageImageCache):
+        """
+        Crops the blocks from _collect_image_blocks, recording saved paths in _crop_paths.
+        Pages are handled page_images.maxsize at a time, so only that many rendered
+        pages are alive at once. Pages are rendered in-process on access, unless
+        render_workers is set: each batch is then rendered by a process pool shared by
+        all batches. Crops are encoded and written in parallel on the I/O pool.
+        """
+        pages = sorted(blocks_by_page)
+        render_pool = None
+        if self.render_workers > 1 and len(pages) > 1:
+            try:
+                render_pool = create_render_pool(self.render_workers)
+            except Exception as e:
+                print(f"Warning: Could not start page rendering workers ({e}). Rendering pages in-process.")
+        try:
+            # Cropping and PNG encoding release the GIL, so crops are saved on a thread pool.
+            # The pool only lives for this pass, so parsers hold no idle threads between parses
+            with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as io_pool:
+                for i in range(0, len(pages), page_images.maxsize):
+                    batch_pages = pages[i:i + page_images.maxsize]
+                    if render_pool is not None:
+                        page_images.warm(batch_pages, render_pool)
+                    self._crop_blocks(
+                        [item for page_idx in batch_pages for item in blocks_by_page[page_idx]],
+                        page_images,
+                        io_pool
+                    )
+        finally:
+            if render_pool is not None:
+                render_pool.shutdown()
+
+    def _crop_blocks(
+        self,
+        items: List[Tuple[Tuple[int, ...], Any, str]],
+        page_images: PageImageCache,
+        io_pool: ThreadPoolExecutor
+    ):
+        """Crops and saves (position, block, node type) items, recording each written crop in _crop_paths."""
+        crop_jobs = {}    # crop key -> (page image, pixel box, save path)
+        assignments = []  # (tree position, crop key)
+        for position, block, block_type in items:
+            planned = self._plan_crop(block, block_type, page_images)
+            if planned:
+                crop_key, (image, box, save_path) = planned
+                # Separate blocks can cover the same region (Layout Parser sometimes
+                # reports a figure twice): save each region and format once
+                if crop_key not in crop_jobs:
+                    # Jobs run concurrently, so no two of them may write the same file
+                    crop_jobs[crop_key] = (image, box, self._claim_save_path(save_path))
+                assignments.append((position, crop_key))
+        
+        crop_keys = list(crop_jobs)
+        saved_paths = dict(zip(
+            crop_keys,
+            io_pool.map(self._save_crop, [crop_jobs[key] for key in crop_keys])
+        ))
+        
+        for position, crop_key in assignments:
+            if saved_paths[crop_key]:
+                self._crop_paths[position] = saved_paths[crop_key]
+
+    def _claim_save_path(self, save_path: str) -> str:
+        """
+        Returns save_path, suffixed with _2, _3, ... if another crop in this parse
+        already claimed it (e.g. blocks without ids all map to block_unknown).
+        """
+        path = Path(save_path)
+        candidate = save_path
+        n = 1
+        while candidate in self._claimed_save_paths:
+            n += 1
+            candidate = str(path.with_name(f"{path.stem}_{n}{path.suffix}"))
+        self._claimed_save_paths.add(candidate)
+        return candidate
+
+    def _plan_crop(self, block, block_type: str, page_images: PageImageCache) -> Optional[Tuple[Tuple[int, ...], Tuple[Image.Image, Tuple[int, int, int, int], str]]]:
+        """
+        Resolves the page image, pixel box and output path for a block's crop.
+        Returns (crop_key, (image, box, save_path)), or None if the block cannot be cropped.
+        crop_key identifies the page region, quantized to CROP_DEDUP_PX pixels, and the
+        output format, so a PNG diagram never shares a fast_mode JPEG crop.
         """
         try:
             layout = getattr(block, 'layout', None)
@@ -302,14 +579,14 @@ class UniversalParser:
             if not bounding_poly:
                 return None
 
-            page_span = getattr(block, 'page_span', None)
-            page_start = getattr(page_span, 'page_start', 1) if page_span else 1
-            page_idx = page_start - 1  # 0-indexed
-            
-            if page_idx < 0 or page_idx >= len(page_images):
+            page_idx = self._get_page_index(block)
+            if page_idx < 0:
                 return None
                 
-            image = page_images[page_idx]
+            try:
+                image = page_images[page_idx]
+            except KeyError:
+                return None
             width, height = image.size
             
             # Get normalized vertices
@@ -318,34 +595,55 @@ class UniversalParser:
                 return None
                 
             # Calculate pixel coordinates
-            x_coords = [getattr(v, 'x', 0) or 0 for v in vertices]
-            y_coords = [getattr(v, 'y', 0) or 0 for v in vertices]
+            min_x, min_y, max_x, max_y = _bbox_extents(vertices)
             
-            x_min = int(min(x_coords) * width)
-            y_min = int(min(y_coords) * height)
-            x_max = int(max(x_coords) * width)
-            y_max = int(max(y_coords) * height)
+            x_min = int(min_x * width)
+            y_min = int(min_y * height)
+            x_max = int(max_x * width)
+            y_max = int(max_y * height)
             
             # Validate crop box
             if x_max <= x_min or y_max <= y_min:
                 return None
             
-            # Crop
-            cropped_img = image.crop((x_min, y_min, x_max, y_max))
+            extension = "jpg" if self.fast_mode and block_type in FAST_MODE_JPEG_TYPES else "png"
+            crop_key = (
+                page_idx,
+                x_min // CROP_DEDUP_PX, y_min // CROP_DEDUP_PX,
+                x_max // CROP_DEDUP_PX, y_max // CROP_DEDUP_PX,
+                extension
+            )
             
-            # Save
             block_id = getattr(block, 'block_id', 'unknown') or 'unknown'
             # Sanitize block_id for filename
             safe_block_id = str(block_id).replace('/', '_').replace('\\', '_')
-            filename = f"block_{safe_block_id}.png"
-            save_path = os.path.join(self.images_dir, filename)
-            cropped_img.save(save_path)
+            save_path = str(self.images_dir / f"block_{safe_block_id}.{extension}")
             
-            return save_path
+            return crop_key, (image, (x_min, y_min, x_max, y_max), save_path)
             
         except Exception as e:
             block_id = getattr(block, 'block_id', 'unknown')
-            print(f"Error saving crop for block {block_id}: {e}")
+            print(f"Error preparing crop for block {block_id}: {e}")
+            return None
+
+    def _save_crop(self, job: Tuple[Image.Image, Tuple[int, int, int, int], str]) -> Optional[str]:
+        """
+        Crops the region from the page image and saves it to disk.
+        Runs on the I/O pool; returns the saved path, or None on failure.
+        """
+        image, box, save_path = job
+        try:
+            cropped_img = image.crop(box)
+            # Crops are intermediates for the vision LLM, so favour encode speed over size
+            if save_path.endswith(".jpg"):
+                if cropped_img.mode not in ("RGB", "L"):
+                    cropped_img = cropped_img.convert("RGB")
+                cropped_img.save(save_path, "JPEG", quality=JPEG_QUALITY)
+            else:
+                cropped_img.save(save_path, "PNG", optimize=False, compress_level=1)
+            return save_path
+        except Exception as e:
+            print(f"Error saving crop {save_path}: {e}")
             return None
 
     def _normalize_bbox(self, bbox) -> List[float]:
@@ -354,7 +652,4 @@ class UniversalParser:
         if not vertices:
             return []
             
-        x_coords = [getattr(v, 'x', 0) or 0 for v in vertices]
-        y_coords = [getattr(v, 'y', 0) or 0 for v in vertices]
-        
-        return [min(x_coords), min(y_coords), max(x_coords), max(y_coords)]
+        return list(_bbox_extents(vertices))
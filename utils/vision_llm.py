@@ -2,18 +2,34 @@
 Vision LLM utilities for flowchart and diagram description
 """
 
+import asyncio
 import os
-import base64
-from typing import Dict, Optional
+import re
+import binascii
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 from PIL import Image
 import io
 
 
+# Read .env once at import instead of on every image
+load_dotenv()
+
+DEFAULT_PROMPT = "Describe this flowchart or diagram in detail."
+DEFAULT_IMAGE_TYPE = "flowchart"
+
+# Diagram keywords for is_likely_diagram (substring matches, case-insensitive)
+_DIAGRAM_KEYWORDS_RE = re.compile(
+    r'figure|diagram|flow ?chart|chart|graph|illustration|process|step|fig\.|algorithm',
+    re.IGNORECASE
+)
+
+
 def describe_image_with_llm(
     image_bytes: bytes,
-    prompt: str = "Describe this flowchart or diagram in detail.",
-    image_type: str = "flowchart"
+    prompt: str = DEFAULT_PROMPT,
+    image_type: str = DEFAULT_IMAGE_TYPE
 ) -> str:
     """
     Get description of an image using Vision LLM
@@ -26,8 +42,6 @@ def describe_image_with_llm(
     Returns:
         Text description of the image
     """
-    load_dotenv()
-    
     provider = os.getenv("LLM_PROVIDER", "openai")
     
     if provider == "openai":
@@ -36,29 +50,134 @@ def describe_image_with_llm(
         return _describe_with_anthropic_vision(image_bytes, prompt, image_type)
 
 
+def describe_images(
+    items: List[Dict[str, Any]],
+    concurrency: int = 8
+) -> List[str]:
+    """
+    Describe several images concurrently (blocking wrapper around describe_images_async)
+    
+    Inside a running event loop (e.g. a Jupyter notebook) await
+    describe_images_async directly instead.
+    
+    Args:
+        items: Dicts with "image_bytes" and optional "prompt" / "image_type"
+        concurrency: Maximum number of LLM requests in flight (rate limiting)
+        
+    Returns:
+        Descriptions in the same order as items
+    """
+    return asyncio.run(describe_images_async(items, concurrency))
+
+
+async def describe_images_async(
+    items: List[Dict[str, Any]],
+    concurrency: int = 8
+) -> List[str]:
+    """
+    Describe several images concurrently using Vision LLM
+    
+    Args:
+        items: Dicts with "image_bytes" and optional "prompt" / "image_type"
+            (same defaults as describe_image_with_llm)
+        concurrency: Maximum number of LLM requests in flight (rate limiting)
+        
+    Returns:
+        Descriptions in the same order as items
+    """
+    provider = os.getenv("LLM_PROVIDER", "openai")
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    def request_args(item: Dict[str, Any]):
+        return (
+            item["image_bytes"],
+            item.get("prompt", DEFAULT_PROMPT),
+            item.get("image_type", DEFAULT_IMAGE_TYPE)
+        )
+    
+    # One client per batch so every request shares its connection pool
+    if provider == "openai":
+        from openai import AsyncOpenAI
+        
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not set in .env file")
+        
+        async with AsyncOpenAI(api_key=api_key) as client:
+            async def describe(item: Dict[str, Any]) -> str:
+                async with semaphore:
+                    response = await client.chat.completions.create(
+                        **_openai_vision_request(*request_args(item))
+                    )
+                return response.choices[0].message.content.strip()
+            
+            return list(await asyncio.gather(*(describe(item) for item in items)))
+    else:
+        from anthropic import AsyncAnthropic
+        
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            raise ValueError("ANTHROPIC_API_KEY not set in .env file")
+        
+        async with AsyncAnthropic(api_key=api_key) as client:
+            async def describe(item: Dict[str, Any]) -> str:
+                async with semaphore:
+                    response = await client.messages.create(
+                        **_anthropic_vision_request(*request_args(item))
+                    )
+                return response.content[0].text.strip()
+            
+            return list(await asyncio.gather(*(describe(item) for item in items)))
+
+
 def _describe_with_openai_vision(
     image_bytes: bytes,
     prompt: str,
     image_type: str
 ) -> str:
     """Describe image using GPT-4 Vision"""
-    from openai import OpenAI
-    
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OPENAI_API_KEY not set in .env file")
     
-    client = OpenAI(api_key=api_key)
+    client = _get_openai_client(api_key)
+    
+    response = client.chat.completions.create(
+        **_openai_vision_request(image_bytes, prompt, image_type)
+    )
+    
+    return response.choices[0].message.content.strip()
+
+
+def _describe_with_anthropic_vision(
+    image_bytes: bytes,
+    prompt: str,
+    image_type: str
+) -> str:
+    """Describe image using Claude 3.5 Sonnet Vision"""
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        raise ValueError("ANTHROPIC_API_KEY not set in .env file")
+    
+    client = _get_anthropic_client(api_key)
+    
+    response = client.messages.create(
+        **_anthropic_vision_request(image_bytes, prompt, image_type)
+    )
     
-    # Encode image to base64
-    base64_image = base64.b64encode(image_bytes).decode('utf-8')
+    return response.content[0].text.strip()
+
+
+def _openai_vision_request(image_bytes: bytes, prompt: str, image_type: str) -> dict:
+    """Build chat.completions.create arguments for an image description"""
+    media_type, base64_image = _encode_image(image_bytes)
     
     # Build enhanced prompt
     enhanced_prompt = _build_vision_prompt(prompt, image_type)
     
-    response = client.chat.completions.create(
-        model="gpt-4o",  # GPT-4 with vision
-        messages=[
+    return {
+        "model": "gpt-4o",  # GPT-4 with vision
+        "messages": [
             {
                 "role": "user",
                 "content": [
@@ -69,46 +188,28 @@ def _describe_with_openai_vision(
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:image/png;base64,{base64_image}"
+                            "url": f"data:{media_type};base64,{base64_image}"
                         }
                     }
                 ]
             }
         ],
-        max_tokens=500,
-        temperature=0.3
-    )
-    
-    return response.choices[0].message.content.strip()
+        "max_tokens": 500,
+        "temperature": 0.3
+    }
 
 
-def _describe_with_anthropic_vision(
-    image_bytes: bytes,
-    prompt: str,
-    image_type: str
-) -> str:
-    """Describe image using Claude 3.5 Sonnet Vision"""
-    from anthropic import Anthropic
-    
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY not set in .env file")
-    
-    client = Anthropic(api_key=api_key)
-    
-    # Encode image to base64
-    base64_image = base64.b64encode(image_bytes).decode('utf-8')
-    
-    # Determine media type
-    media_type = "image/png"  # Assume PNG, adjust if needed
+def _anthropic_vision_request(image_bytes: bytes, prompt: str, image_type: str) -> dict:
+    """Build messages.create arguments for an image description"""
+    media_type, base64_image = _encode_image(image_bytes)
     
     enhanced_prompt = _build_vision_prompt(prompt, image_type)
     
-    response = client.messages.create(
-        model="claude-3-5-sonnet-20241022",
-        max_tokens=500,
-        temperature=0.3,
-        messages=[
+    return {
+        "model": "claude-3-5-sonnet-20241022",
+        "max_tokens": 500,
+        "temperature": 0.3,
+        "messages": [
             {
                 "role": "user",
                 "content": [
@@ -127,9 +228,41 @@ def _describe_with_anthropic_vision(
                 ]
             }
         ]
+    }
+
+
+def _encode_image(image_bytes: bytes) -> Tuple[str, str]:
+    """Returns (media_type, base64 data) for an image, as both providers expect"""
+    # b2a_base64 encodes in a single C call, straight to ASCII bytes
+    return (
+        _detect_media_type(image_bytes),
+        binascii.b2a_base64(image_bytes, newline=False).decode('ascii')
     )
-    
-    return response.content[0].text.strip()
+
+
+def _detect_media_type(image_bytes: bytes) -> str:
+    """Detect the image media type from its magic bytes (defaults to PNG)"""
+    if image_bytes.startswith(b'\xff\xd8'):
+        return "image/jpeg"
+    if image_bytes.startswith(b'GIF8'):
+        return "image/gif"
+    if image_bytes[:4] == b'RIFF' and image_bytes[8:12] == b'WEBP':
+        return "image/webp"
+    return "image/png"
+
+
+@lru_cache(maxsize=1)
+def _get_openai_client(api_key: str):
+    """Shared OpenAI client, so its HTTP connection pool is reused across images"""
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=1)
+def _get_anthropic_client(api_key: str):
+    """Shared Anthropic client, so its HTTP connection pool is reused across images"""
+    from anthropic import Anthropic
+    return Anthropic(api_key=api_key)
 
 
 def _build_vision_prompt(base_prompt: str, image_type: str) -> str:
@@ -176,7 +309,8 @@ This is a table. Please describe:
 def extract_image_from_pdf(
     pdf_path: str,
     page_num: int,
-    bbox: Dict[str, float]
+    bbox: Dict[str, float],
+    fmt: str = "jpeg"
 ) -> bytes:
     """
     Extract image region from PDF page
@@ -185,25 +319,20 @@ def extract_image_from_pdf(
         pdf_path: Path to PDF file
         page_num: Page number (0-indexed)
         bbox: Bounding box dict with keys: x_min, y_min, x_max, y_max (normalized 0-1)
+        fmt: Intermediate page format for pdftoppm, used only when pypdfium2 is
+            unavailable and pages are rendered through pdf2image ("jpeg" is faster than "ppm")
         
     Returns:
         Image bytes (PNG format)
     """
-    from pdf2image import convert_from_path
+    from .pdf_pages import RENDER_DPI, render_page
     
-    # Convert PDF page to image
-    images = convert_from_path(
-        pdf_path,
-        first_page=page_num + 1,
-        last_page=page_num + 1,
-        dpi=200
-    )
+    # Convert PDF page to image (reuses the page if the parser already rendered it)
+    page_image = render_page(pdf_path, page_num, dpi=RENDER_DPI, fmt=fmt)
     
-    if not images:
+    if page_image is None:
         raise ValueError(f"Could not extract page {page_num} from PDF")
     
-    page_image = images[0]
-    
     # Calculate pixel coordinates from normalized bbox
     width, height = page_image.size
     x_min = int(bbox['x_min'] * width)
@@ -214,12 +343,11 @@ def extract_image_from_pdf(
     # Crop image
     cropped = page_image.crop((x_min, y_min, x_max, y_max))
     
-    # Convert to bytes
+    # Convert to bytes (getvalue() returns the buffer without an extra read copy)
     img_bytes = io.BytesIO()
-    cropped.save(img_bytes, format='PNG')
-    img_bytes.seek(0)
+    cropped.save(img_bytes, format='PNG', compress_level=1)
     
-    return img_bytes.read()
+    return img_bytes.getvalue()
 
 
 def is_likely_diagram(
@@ -245,17 +373,9 @@ def is_likely_diagram(
     if area < 0.05:  # Less than 5% of page - likely decorative
         return False
     
-    # Check for diagram keywords in nearby text
-    diagram_keywords = [
-        'figure', 'diagram', 'flowchart', 'flow chart',
-        'chart', 'graph', 'illustration', 'process',
-        'step', 'fig.', 'algorithm'
-    ]
-    
-    if page_text:
-        text_lower = page_text.lower()
-        if any(keyword in text_lower for keyword in diagram_keywords):
-            return True
+    # Check for diagram keywords in nearby text (one regex scan, no lowercase copy)
+    if page_text and _DIAGRAM_KEYWORDS_RE.search(page_text):
+        return True
     
     # Default: assume it's a diagram if reasonably sized
     return area >= 0.05